@@ -6,7 +6,7 @@ import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, issue_registry as ir
 from homeassistant.helpers.event import async_track_entity_registry_updated_event
 from homeassistant.helpers.issue_registry import IssueSeverity
@@ -14,9 +14,13 @@ from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     CONF_CALENDARS,
+    CONF_SECRET,
     DATA_CACHE,
     DATA_ENTRIES,
+    DATA_INFLIGHT,
     DATA_LISTENERS,
+    DATA_MISSING,
+    DATA_SECRET_INDEX,
     DATA_VIEW,
     DOMAIN,
 )
@@ -39,6 +43,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     domain_data = _async_get_domain_data(hass)
     domain_data[DATA_ENTRIES][entry.entry_id] = entry
     domain_data[DATA_CACHE].pop(entry.entry_id, None)
+    _async_index_secret(hass, entry)
     _async_register_registry_listener(hass, entry)
     _async_check_missing_calendars(hass, entry)
     entry.async_on_unload(entry.add_update_listener(_update_entry))
@@ -50,7 +55,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     domain_data = _async_get_domain_data(hass)
     domain_data[DATA_ENTRIES].pop(entry.entry_id, None)
     domain_data[DATA_CACHE].pop(entry.entry_id, None)
+    _async_unindex_secret(hass, entry.entry_id)
     _async_remove_registry_listener(hass, entry.entry_id)
+    domain_data[DATA_MISSING].pop(entry.entry_id, None)
     ir.async_delete_issue(hass, DOMAIN, _build_issue_id(entry.entry_id))
     return True
 
@@ -60,6 +67,7 @@ async def _update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     domain_data = _async_get_domain_data(hass)
     domain_data[DATA_ENTRIES][entry.entry_id] = entry
     domain_data[DATA_CACHE].pop(entry.entry_id, None)
+    _async_index_secret(hass, entry)
     _async_register_registry_listener(hass, entry)
     _async_check_missing_calendars(hass, entry)
 
@@ -73,36 +81,65 @@ def _async_get_domain_data(hass: HomeAssistant) -> dict[str, Any]:
             DATA_LISTENERS: {},
             DATA_VIEW: False,
             DATA_CACHE: {},
+            DATA_INFLIGHT: {},
+            DATA_SECRET_INDEX: {},
+            DATA_MISSING: {},
         },
     )
 
 
+def _async_index_secret(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Map the entry secret to the entry so the view can find it directly."""
+    _async_unindex_secret(hass, entry.entry_id)
+    secret = entry.data.get(CONF_SECRET)
+    if isinstance(secret, str):
+        _async_get_domain_data(hass)[DATA_SECRET_INDEX][secret] = entry.entry_id
+
+
+def _async_unindex_secret(hass: HomeAssistant, entry_id: str) -> None:
+    """Drop any secret that still points to the entry."""
+    index: dict[str, str] = _async_get_domain_data(hass)[DATA_SECRET_INDEX]
+    for secret in [key for key, value in index.items() if value == entry_id]:
+        del index[secret]
+
+
 def _async_register_registry_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Track entity registry updates for the configured calendars."""
     domain_data = _async_get_domain_data(hass)
+    calendars = tuple(
+        entity_id.lower() for entity_id in entry.data.get(CONF_CALENDARS, ())
+    )
+    # Keep the existing subscription when the tracked calendars are unchanged.
+    tracked = domain_data[DATA_LISTENERS].get(entry.entry_id)
+    if tracked is not None and tracked[0] == calendars:
+        return
     _async_remove_registry_listener(hass, entry.entry_id)
-    calendars = [entity_id.lower() for entity_id in entry.data.get(CONF_CALENDARS, [])]
     if not calendars:
         return
 
     entry_id = entry.entry_id
 
     @callback
-    def _handle_registry_event(_event) -> None:
+    def _handle_registry_event(event: Event[er.EventEntityRegistryUpdatedData]) -> None:
         if entry_id not in domain_data[DATA_ENTRIES]:
             return
+        # Plain updates keep the entity registered; only creations, removals
+        # and renames can change which calendars are missing.
+        if event.data["action"] == "update" and "old_entity_id" not in event.data:
+            return
         _async_check_missing_calendars(hass, domain_data[DATA_ENTRIES][entry_id])
 
     listener = async_track_entity_registry_updated_event(
         hass, calendars, _handle_registry_event
     )
-    domain_data[DATA_LISTENERS][entry.entry_id] = listener
+    domain_data[DATA_LISTENERS][entry.entry_id] = (calendars, listener)
 
 
 def _async_remove_registry_listener(hass: HomeAssistant, entry_id: str) -> None:
     """Remove a previously registered registry listener."""
     domain_data = _async_get_domain_data(hass)
-    if unsub := domain_data[DATA_LISTENERS].pop(entry_id, None):
+    if tracked := domain_data[DATA_LISTENERS].pop(entry_id, None):
+        _calendars, unsub = tracked
         unsub()
 
 
@@ -114,11 +151,18 @@ def _build_issue_id(entry_id: str) -> str:
 def _async_check_missing_calendars(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Create or clear a repair issue when a calendar disappears."""
     registry = er.async_get(hass)
-    missing = [
+    missing = tuple(
         entity_id
         for entity_id in entry.data.get(CONF_CALENDARS, [])
         if registry.async_get(entity_id) is None
-    ]
+    )
+
+    # Only touch the issue registry when the outcome changes.
+    last_checked = _async_get_domain_data(hass)[DATA_MISSING]
+    state = (entry.title, missing)
+    if last_checked.get(entry.entry_id) == state:
+        return
+    last_checked[entry.entry_id] = state
 
     issue_id = _build_issue_id(entry.entry_id)
     if missing:
@@ -41,7 +41,7 @@ from .const import (
 )
 from .util import build_feed_url, generate_secret
 
-_DATA_KEYS = (CONF_CALENDARS, CONF_PAST_DAYS, CONF_FUTURE_DAYS, CONF_SECRET)
+_DATA_KEYS = frozenset({CONF_CALENDARS, CONF_PAST_DAYS, CONF_FUTURE_DAYS, CONF_SECRET})
 
 
 class ICalFeedConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -244,7 +244,7 @@ def _build_calendar_selector(
 
 def _filter_entry_data(data: Mapping[str, Any]) -> dict[str, Any]:
     """Return only the supported config entry data keys."""
-    return {key: data[key] for key in _DATA_KEYS if key in data}
+    return {key: value for key, value in data.items() if key in _DATA_KEYS}
 
 
 def _get_calendar_choices(hass: HomeAssistant) -> dict[str, str]:
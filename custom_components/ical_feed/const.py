@@ -6,6 +6,9 @@ DATA_ENTRIES = "entries"
 DATA_LISTENERS = "listeners"
 DATA_VIEW = "view_registered"
 DATA_CACHE = "cache"
+DATA_INFLIGHT = "inflight"
+DATA_SECRET_INDEX = "secret_index"
+DATA_MISSING = "missing_calendars"
 
 CONF_CALENDARS = "calendars"
 CONF_SECRET = "secret"
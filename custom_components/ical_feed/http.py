@@ -7,9 +7,10 @@ from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
 import hashlib
-import json
 import logging
+from operator import itemgetter
 import secrets
 from time import monotonic
 
@@ -17,6 +18,7 @@ from aiohttp import web
 
 from homeassistant.components import calendar
 from homeassistant.components.calendar import DATA_COMPONENT as CALENDAR_DATA_COMPONENT
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_component import EntityComponent
@@ -30,6 +32,8 @@ from .const import (
     CONF_SECRET,
     DATA_CACHE,
     DATA_ENTRIES,
+    DATA_INFLIGHT,
+    DATA_SECRET_INDEX,
     DEFAULT_FUTURE_DAYS,
     DEFAULT_PAST_DAYS,
     DOMAIN,
@@ -41,18 +45,25 @@ from .util import get_feed_slug, log_feed_summary
 _LOGGER = logging.getLogger(__name__)
 ICAL_CONTENT_TYPE = "text/calendar"
 
-type CalendarEventTuple = tuple[str, calendar.CalendarEvent, str]
+type CalendarEventTuple = tuple[datetime, str, calendar.CalendarEvent, str]
 
 _CACHE_TTL = 30.0
 
+# Fixed calendar header lines, pre-joined so each feed only adds its own name.
+_CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Home Assistant iCal Feed//EN"
+)
+_CALENDAR_FOOTER = "END:VCALENDAR"
+
 
 @dataclass(slots=True)
 class _FeedCacheEntry:
-    payload: str
+    payload: bytes
     etag: str
     last_modified: datetime
+    last_modified_http: str
     expires_at: float
-    config_hash: str
+    config_hash: int
 
 
 class ICalFeedView(HomeAssistantView):
@@ -76,23 +87,22 @@ class ICalFeedView(HomeAssistantView):
         if not entries:
             raise web.HTTPNotFound
 
-        entry = None
-        for candidate in entries.values():
-            candidate_secret = candidate.data.get(CONF_SECRET)
-            if isinstance(candidate_secret, str) and secrets.compare_digest(
-                candidate_secret, secret
-            ):
-                entry = candidate
-                break
-        if entry is None:
+        entry_id = domain_data.get(DATA_SECRET_INDEX, {}).get(secret)
+        if entry_id is None or (entry := entries.get(entry_id)) is None:
+            raise web.HTTPNotFound
+        data = entry.data
+        entry_secret = data.get(CONF_SECRET)
+        if not isinstance(entry_secret, str) or not secrets.compare_digest(
+            entry_secret, secret
+        ):
             raise web.HTTPNotFound
 
         if feed != get_feed_slug(entry):
             raise web.HTTPNotFound
 
-        calendars = entry.data.get(CONF_CALENDARS, [])
-        past_days = entry.data.get(CONF_PAST_DAYS, DEFAULT_PAST_DAYS)
-        future_days = entry.data.get(CONF_FUTURE_DAYS, DEFAULT_FUTURE_DAYS)
+        calendars = data.get(CONF_CALENDARS, [])
+        past_days = data.get(CONF_PAST_DAYS, DEFAULT_PAST_DAYS)
+        future_days = data.get(CONF_FUTURE_DAYS, DEFAULT_FUTURE_DAYS)
         time_zone = _get_time_zone_id(self.hass)
 
         config_hash = _hash_config(
@@ -105,66 +115,159 @@ class ICalFeedView(HomeAssistantView):
         cached = _get_cached_feed(
             self.hass, entry.entry_id, config_hash, allow_expired=True
         )
-        if cached is not None and cached.expires_at > monotonic():
-            response_headers = _build_response_headers(
-                cached.etag, cached.last_modified
-            )
-            if _is_not_modified(request, cached.etag, cached.last_modified):
+
+        not_modified = False
+        if cached is not None:
+            not_modified = _is_not_modified(request, cached.etag, cached.last_modified)
+            if cached.expires_at > monotonic():
+                response_headers = _build_response_headers(
+                    cached.etag, cached.last_modified_http
+                )
+                if not_modified:
+                    return web.Response(
+                        status=web.HTTPNotModified.status_code,
+                        headers=response_headers,
+                    )
                 return web.Response(
-                    status=web.HTTPNotModified.status_code, headers=response_headers
+                    body=cached.payload,
+                    content_type=ICAL_CONTENT_TYPE,
+                    charset="utf-8",
+                    headers=response_headers,
                 )
-            return web.Response(
-                text=cached.payload,
-                content_type=ICAL_CONTENT_TYPE,
-                headers=response_headers,
-            )
 
-        ical_payload, event_count = await _async_generate_calendar(
+        task = _get_refresh_task(
             self.hass,
-            entry.title or "Home Assistant Feed",
+            entry,
             calendars,
             past_days,
             future_days,
             time_zone,
+            config_hash,
+            cached,
         )
-
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            _LOGGER.debug(
-                "iCal payload for '%s':\n%s",
-                entry.title or entry.entry_id,
-                ical_payload,
+        if cached is not None and not_modified:
+            # The client already holds the last payload; revalidate it right
+            # away and let the refresh finish in the background.
+            return web.Response(
+                status=web.HTTPNotModified.status_code,
+                headers=_build_response_headers(cached.etag, cached.last_modified_http),
             )
-        log_feed_summary(_LOGGER, entry, str(request.url), event_count)
 
-        etag = _etag_for_payload(ical_payload)
-        now = dt_util.utcnow().replace(microsecond=0)
-        last_modified = (
-            cached.last_modified if cached is not None and cached.etag == etag else now
-        )
-        _set_cached_feed(
-            self.hass,
-            entry.entry_id,
-            _FeedCacheEntry(
-                payload=ical_payload,
-                etag=etag,
-                last_modified=last_modified,
-                expires_at=monotonic() + _CACHE_TTL,
-                config_hash=config_hash,
-            ),
-        )
+        try:
+            fresh, event_count = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The entry was unloaded while its feed was being generated.
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                raise web.HTTPNotFound from None
+            raise
 
-        response_headers = _build_response_headers(etag, last_modified)
-        if _is_not_modified(request, etag, last_modified):
+        log_feed_summary(_LOGGER, entry, str(request.url), event_count)
+
+        response_headers = _build_response_headers(fresh.etag, fresh.last_modified_http)
+        if _is_not_modified(request, fresh.etag, fresh.last_modified):
             return web.Response(
                 status=web.HTTPNotModified.status_code, headers=response_headers
             )
         return web.Response(
-            text=ical_payload,
+            body=fresh.payload,
             content_type=ICAL_CONTENT_TYPE,
+            charset="utf-8",
             headers=response_headers,
         )
 
 
+def _get_refresh_task(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    calendars: Iterable[str],
+    past_days: int,
+    future_days: int,
+    time_zone: str,
+    config_hash: int,
+    previous: _FeedCacheEntry | None,
+) -> asyncio.Task[tuple[_FeedCacheEntry, int]]:
+    """Return the refresh shared by concurrent requests, starting it if needed."""
+    inflight: dict[tuple[str, int], asyncio.Task[tuple[_FeedCacheEntry, int]]]
+    inflight = hass.data[DOMAIN].setdefault(DATA_INFLIGHT, {})
+    key = (entry.entry_id, config_hash)
+    if (task := inflight.get(key)) is not None:
+        return task
+
+    # Tied to the entry so unloading it cancels the refresh.
+    task = entry.async_create_background_task(
+        hass,
+        _async_refresh_feed(
+            hass,
+            entry,
+            calendars,
+            past_days,
+            future_days,
+            time_zone,
+            config_hash,
+            previous,
+        ),
+        f"{DOMAIN} refresh {entry.entry_id}",
+    )
+    inflight[key] = task
+    task.add_done_callback(lambda _: inflight.pop(key, None))
+    task.add_done_callback(_log_refresh_error)
+    return task
+
+
+def _log_refresh_error(task: asyncio.Task[tuple[_FeedCacheEntry, int]]) -> None:
+    """Log a failed refresh once, whether or not a request awaits it."""
+    if task.cancelled() or (err := task.exception()) is None:
+        return
+    _LOGGER.error(
+        "Background refresh %s failed: %s", task.get_name(), err, exc_info=err
+    )
+
+
+async def _async_refresh_feed(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    calendars: Iterable[str],
+    past_days: int,
+    future_days: int,
+    time_zone: str,
+    config_hash: int,
+    previous: _FeedCacheEntry | None,
+) -> tuple[_FeedCacheEntry, int]:
+    """Generate the feed for an entry and store it in the cache."""
+    payload, etag, event_count = await _async_generate_calendar(
+        hass,
+        entry.title or "Home Assistant Feed",
+        calendars,
+        past_days,
+        future_days,
+        time_zone,
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "iCal payload for '%s':\n%s",
+            entry.title or entry.entry_id,
+            payload.decode("utf-8"),
+        )
+
+    if previous is not None and previous.etag == etag:
+        last_modified = previous.last_modified
+        last_modified_http = previous.last_modified_http
+    else:
+        last_modified = dt_util.utcnow().replace(microsecond=0)
+        last_modified_http = format_datetime(last_modified, usegmt=True)
+    cached = _FeedCacheEntry(
+        payload=payload,
+        etag=etag,
+        last_modified=last_modified,
+        last_modified_http=last_modified_http,
+        expires_at=monotonic() + _CACHE_TTL,
+        config_hash=config_hash,
+    )
+    _set_cached_feed(hass, entry.entry_id, cached)
+    return cached, event_count
+
+
 async def _async_generate_calendar(
     hass: HomeAssistant,
     title: str,
@@ -172,7 +275,7 @@ async def _async_generate_calendar(
     past_days: int,
     future_days: int,
     time_zone: str,
-) -> tuple[str, int]:
+) -> tuple[bytes, str, int]:
     """Collect events from the selected calendars and produce an iCal payload."""
     utc_now = dt_util.utcnow()
     start = utc_now - timedelta(days=past_days)
@@ -183,60 +286,100 @@ async def _async_generate_calendar(
     component: EntityComponent[calendar.CalendarEntity] | None = hass.data.get(
         CALENDAR_DATA_COMPONENT
     )
-    events: list[CalendarEventTuple] = []
     entities = list(_iter_calendar_entities(component, calendars)) if calendars else []
-    if entities:
+    if len(entities) == 1:
+        # Awaiting directly avoids wrapping the common single calendar in a task.
+        entity_id, entity = entities[0]
+        results = [
+            await _async_get_entity_events(
+                hass, entity_id, entity, start_local, end_local
+            )
+        ]
+    elif entities:
         results = await asyncio.gather(
-            *(
-                entity.async_get_events(hass, start_local, end_local)
-                for _, entity in entities
-            ),
-            return_exceptions=True,
-        )
-        for (entity_id, _), result in zip(entities, results, strict=True):
-            if isinstance(result, BaseException):
-                if isinstance(result, asyncio.CancelledError):
-                    raise result
-                if isinstance(result, HomeAssistantError):
-                    continue
-                _LOGGER.debug(
-                    "Unexpected error getting events for %s: %s",
-                    entity_id,
-                    result,
+            *[
+                _async_get_entity_events(
+                    hass, entity_id, entity, start_local, end_local
                 )
-                continue
+                for entity_id, entity in entities
+            ]
+        )
+    else:
+        results = []
+
+    # Sorting, rendering and hashing is CPU bound, keep it off the event loop.
+    return await hass.async_add_executor_job(
+        _build_calendar,
+        title,
+        time_zone,
+        utc_now,
+        [
+            (entity_id, result)
+            for (entity_id, _), result in zip(entities, results, strict=True)
+        ],
+    )
 
-            for event in result:
-                summary = getattr(event, "summary", "") or ""
-                events.append((entity_id, event, summary))
 
-    default_sort_value = utc_now
-    events.sort(
-        key=lambda item: _ensure_datetime(getattr(item[1], "start", None))
-        or default_sort_value
-    )
+def _build_calendar(
+    title: str,
+    time_zone: str,
+    utc_now: datetime,
+    entity_events: Iterable[tuple[str, Iterable[calendar.CalendarEvent]]],
+) -> tuple[bytes, str, int]:
+    """Render the collected events as a UTF-8 iCal payload with its ETag."""
+    events: list[CalendarEventTuple] = []
+    for entity_id, result in entity_events:
+        for event in result:
+            sort_key = _ensure_datetime(event.start) or utc_now
+            events.append((sort_key, entity_id, event, event.summary or ""))
+
+    events.sort(key=itemgetter(0))
 
     lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Home Assistant iCal Feed//EN",
+        _CALENDAR_HEADER,
         f"X-WR-CALNAME:{_escape_value(title)}",
         f"X-WR-TIMEZONE:{_escape_value(time_zone)}",
     ]
 
-    for entity_id, event, summary in events:
-        lines.extend(
-            _format_event(
-                entity_id,
-                event,
-                utc_now,
-                time_zone,
-                summary_override=summary,
-            )
+    dtstamp = _format_datetime(utc_now)
+    lines.extend(
+        _format_event(
+            entity_id,
+            event,
+            utc_now,
+            time_zone,
+            summary_override=summary,
+            dtstamp=dtstamp,
+            start_dt=start_dt,
         )
+        for start_dt, entity_id, event, summary in events
+    )
 
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n", len(events)
+    # The empty sentinel makes the join emit the trailing CRLF.
+    lines.extend((_CALENDAR_FOOTER, ""))
+    payload = "\r\n".join(lines).encode("utf-8")
+    return payload, _etag_for_payload(payload), len(events)
+
+
+async def _async_get_entity_events(
+    hass: HomeAssistant,
+    entity_id: str,
+    entity: calendar.CalendarEntity,
+    start: datetime,
+    end: datetime,
+) -> list[calendar.CalendarEvent]:
+    """Return the events of a calendar entity, or none when it fails."""
+    try:
+        return await entity.async_get_events(hass, start, end)
+    except HomeAssistantError:
+        return []
+    except Exception as err:  # noqa: BLE001
+        _LOGGER.debug(
+            "Unexpected error getting events for %s: %s",
+            entity_id,
+            err,
+        )
+        return []
 
 
 def _format_event(
@@ -245,52 +388,55 @@ def _format_event(
     now: datetime,
     time_zone: str,
     summary_override: str | None = None,
-) -> list[str]:
-    """Translate a Home Assistant calendar event into RFC5545 iCal lines."""
-    lines = ["BEGIN:VEVENT"]
-
-    summary_attr = getattr(event, "summary", "") or ""
-    uid = getattr(event, "uid", None)
+    *,
+    dtstamp: str | None = None,
+    start_dt: datetime | None = None,
+) -> str:
+    """Translate a Home Assistant calendar event into an RFC5545 VEVENT block.
+
+    The block is returned as a single string without a trailing line break.
+    ``dtstamp`` is the preformatted ``now`` shared by every event in the feed
+    and ``start_dt`` the already resolved start used to sort the feed.
+    """
+    start = event.start
+    summary_attr = event.summary or ""
+    uid = event.uid
     if not uid:
-        uid_source = f"{entity_id}-{event.start}-{summary_attr}"
-        uid = hashlib.sha256(uid_source.encode("utf-8")).hexdigest()
-
-    is_all_day = getattr(event, "all_day", False)
-    start_dt_value = _ensure_datetime(getattr(event, "start", None)) or now
-    end_dt_value = _ensure_datetime(getattr(event, "end", None)) or start_dt_value
-
-    if is_all_day:
-        start_dt = dt_util.start_of_local_day(dt_util.as_local(start_dt_value))
-        end_dt = dt_util.start_of_local_day(dt_util.as_local(end_dt_value))
-        lines.append(f"DTSTART;VALUE=DATE:{start_dt.date().strftime('%Y%m%d')}")
-        lines.append(f"DTEND;VALUE=DATE:{end_dt.date().strftime('%Y%m%d')}")
+        uid_source = f"{entity_id}-{start}-{summary_attr}"
+        uid = hashlib.blake2b(uid_source.encode("utf-8"), digest_size=16).hexdigest()
+
+    start_dt_value = start_dt or _ensure_datetime(start) or now
+    end_dt_value = _ensure_datetime(event.end) or start_dt_value
+
+    if event.all_day:
+        # All-day events only carry the local calendar date.
+        start_date = dt_util.as_local(start_dt_value).date()
+        end_date = dt_util.as_local(end_dt_value).date()
+        dtstart = f"DTSTART;VALUE=DATE:{start_date.strftime('%Y%m%d')}"
+        dtend = f"DTEND;VALUE=DATE:{end_date.strftime('%Y%m%d')}"
     elif time_zone == "UTC":
-        lines.append(f"DTSTART:{_format_datetime(start_dt_value)}")
-        lines.append(f"DTEND:{_format_datetime(end_dt_value)}")
+        dtstart = f"DTSTART:{_format_datetime(start_dt_value)}"
+        dtend = f"DTEND:{_format_datetime(end_dt_value)}"
     else:
-        lines.append(
-            f"DTSTART;TZID={time_zone}:{_format_datetime_local(start_dt_value)}"
-        )
-        lines.append(f"DTEND;TZID={time_zone}:{_format_datetime_local(end_dt_value)}")
-
-    lines.append(f"DTSTAMP:{_format_datetime(now)}")
-    summary = (
-        summary_override
-        if summary_override is not None
-        else getattr(event, "summary", "") or ""
-    )
-    description = getattr(event, "description", "")
-    location = getattr(event, "location", "")
+        dtstart = f"DTSTART;TZID={time_zone}:{_format_datetime_local(start_dt_value)}"
+        dtend = f"DTEND;TZID={time_zone}:{_format_datetime_local(end_dt_value)}"
 
-    lines.append(f"SUMMARY:{_escape_value(summary)}")
-    if description:
-        lines.append(f"DESCRIPTION:{_escape_value(description)}")
-    if location:
-        lines.append(f"LOCATION:{_escape_value(location)}")
+    summary = summary_override if summary_override is not None else summary_attr
+    details = ""
+    if description := event.description:
+        details += f"\r\nDESCRIPTION:{_escape_value(description)}"
+    if location := event.location:
+        details += f"\r\nLOCATION:{_escape_value(location)}"
 
-    lines.append(f"UID:{uid}")
-    lines.append("END:VEVENT")
-    return lines
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"{dtstart}\r\n"
+        f"{dtend}\r\n"
+        f"DTSTAMP:{dtstamp or _format_datetime(now)}\r\n"
+        f"SUMMARY:{_escape_value(summary)}{details}\r\n"
+        f"UID:{uid}\r\n"
+        "END:VEVENT"
+    )
 
 
 def _format_datetime(value: datetime) -> str:
@@ -303,8 +449,13 @@ def _format_datetime_local(value: datetime) -> str:
     return dt_util.as_local(value).strftime("%Y%m%dT%H%M%S")
 
 
+@lru_cache(maxsize=2048)
 def _escape_value(text: str) -> str:
-    """Escape text according to the RFC5545 rules."""
+    """Escape text according to the RFC5545 rules.
+
+    Summaries, descriptions and locations repeat heavily across recurring
+    events, so results are memoized.
+    """
     return (
         text.replace("\\", "\\\\")
         .replace("\n", "\\n")
@@ -326,25 +477,17 @@ def _ensure_datetime(value: datetime | date | dict | None) -> datetime | None:
     if not isinstance(value, dict):
         return None
 
-    if date_time := value.get("dateTime"):
-        parsed = dt_util.parse_datetime(date_time)
-        if parsed:
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-            return parsed
-
-    if date_only := value.get("date"):
-        parsed = dt_util.parse_datetime(date_only)
-        if parsed:
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-            return parsed
+    # Prefer the full timestamp and fall back to the date-only form.
+    for key in ("dateTime", "date"):
+        if not (raw := value.get(key)):
+            continue
         try:
-            return datetime.fromisoformat(f"{date_only}T00:00:00").replace(
-                tzinfo=dt_util.DEFAULT_TIME_ZONE
-            )
-        except ValueError:
-            return None
+            parsed = datetime.fromisoformat(raw)
+        except (TypeError, ValueError):
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        return parsed
 
     return None
 
@@ -371,20 +514,11 @@ def _hash_config(
     past_days: int,
     future_days: int,
     time_zone: str,
-) -> str:
-    """Return a stable hash that identifies the feed configuration."""
-    payload = json.dumps(
-        {
-            "title": title or "",
-            "calendars": sorted(calendars),
-            "past_days": past_days,
-            "future_days": future_days,
-            "time_zone": time_zone,
-        },
-        separators=(",", ":"),
-        sort_keys=True,
-    ).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+) -> int:
+    """Return a cheap fingerprint that identifies the feed configuration."""
+    return hash(
+        (title or "", tuple(sorted(calendars)), past_days, future_days, time_zone)
+    )
 
 
 def _get_time_zone_id(hass: HomeAssistant) -> str:
@@ -392,17 +526,17 @@ def _get_time_zone_id(hass: HomeAssistant) -> str:
     return hass.config.time_zone or "UTC"
 
 
-def _etag_for_payload(payload: str) -> str:
+def _etag_for_payload(payload: bytes) -> str:
     """Return an RFC-compatible ETag for a generated feed."""
-    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
     return f'"{digest}"'
 
 
-def _build_response_headers(etag: str, last_modified: datetime) -> dict[str, str]:
+def _build_response_headers(etag: str, last_modified_http: str) -> dict[str, str]:
     """Build response headers for cache validation."""
     return {
         "ETag": etag,
-        "Last-Modified": format_datetime(dt_util.as_utc(last_modified), usegmt=True),
+        "Last-Modified": last_modified_http,
         "Cache-Control": "private, max-age=0, must-revalidate",
     }
 
@@ -413,8 +547,7 @@ def _etag_matches(header_value: str, etag: str) -> bool:
         return False
     if header_value.strip() == "*":
         return True
-    candidates = [value.strip() for value in header_value.split(",")]
-    return etag in candidates
+    return any(value.strip() == etag for value in header_value.split(","))
 
 
 def _is_not_modified(request: web.Request, etag: str, last_modified: datetime) -> bool:
@@ -436,7 +569,7 @@ def _is_not_modified(request: web.Request, etag: str, last_modified: datetime) -
 
 
 def _get_cached_feed(
-    hass: HomeAssistant, entry_id: str, config_hash: str, *, allow_expired: bool = False
+    hass: HomeAssistant, entry_id: str, config_hash: int, *, allow_expired: bool = False
 ) -> _FeedCacheEntry | None:
     """Return cached feed contents if still valid."""
     domain_data = hass.data.get(DOMAIN)
@@ -460,5 +593,8 @@ def _set_cached_feed(
     domain_data = hass.data.get(DOMAIN)
     if not domain_data:
         return
+    # A refresh may outlive its entry; don't keep a payload nobody can fetch.
+    if entry_id not in domain_data.get(DATA_ENTRIES, {}):
+        return
     cache = domain_data.setdefault(DATA_CACHE, {})
     cache[entry_id] = cached
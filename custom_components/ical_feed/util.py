@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from logging import Logger
+from logging import INFO, Logger
 import secrets
 
 from homeassistant.config_entries import ConfigEntry
@@ -54,26 +54,25 @@ def mask_feed_url(url: str) -> str:
     if not url:
         return ""
     marker = "/ical/"
-    if marker not in url:
+    if (start := url.find(marker)) < 0:
         return url
-    prefix, remainder = url.split(marker, 1)
-    parts = remainder.split("/", 2)
-    if len(parts) < 2:
+    start += len(marker)
+    if (end := url.find("/", start)) < 0:
         return url
-    secret = parts[0]
+    secret = url[start:end]
     if len(secret) <= 6:
         masked_secret = "***"
     else:
         masked_secret = f"{secret[:4]}…{secret[-4:]}"
-    parts[0] = masked_secret
-    masked_path = "/".join(parts)
-    return f"{prefix}{marker}{masked_path}"
+    return f"{url[:start]}{masked_secret}{url[end:]}"
 
 
 def log_feed_summary(
     logger: Logger, entry: ConfigEntry, url: str, event_count: int
 ) -> None:
     """Log a short summary about a generated feed."""
+    if not logger.isEnabledFor(INFO):
+        return
     masked = mask_feed_url(url)
     entry_name = entry.title or entry.entry_id
     logger.info(
@@ -0,0 +1,14 @@
+"""Fixtures for the ical_feed custom component tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.components.ical_feed.common import use_repo_config_dir
+
+
+@pytest.fixture(autouse=True)
+def _repo_config_dir(request: pytest.FixtureRequest) -> None:
+    """Point every test that uses hass at the repository config dir."""
+    if "hass" in request.fixturenames:
+        use_repo_config_dir(request.getfixturevalue("hass"))
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
-from tests.components.ical_feed.common import use_repo_config_dir
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
@@ -30,7 +29,6 @@ async def test_flow_aborts_without_calendars(
     hass: HomeAssistant, enable_custom_integrations: None
 ) -> None:
     """Test the user step aborts when no calendar entities exist."""
-    use_repo_config_dir(hass)
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
@@ -42,7 +40,6 @@ async def test_flow_creates_entry(
     hass: HomeAssistant, enable_custom_integrations: None
 ) -> None:
     """Test selecting a calendar creates a config entry."""
-    use_repo_config_dir(hass)
     registry = er.async_get(hass)
     calendar_entry = registry.async_get_or_create(
         "calendar",
@@ -82,7 +79,6 @@ async def test_options_flow_updates_entry(
     hass: HomeAssistant, enable_custom_integrations: None
 ) -> None:
     """Test the options flow updates the entry data."""
-    use_repo_config_dir(hass)
     entry = MockConfigEntry(
         domain=DOMAIN,
         data={
@@ -135,7 +131,6 @@ async def test_reauth_flow_rotates_secret(
     hass: HomeAssistant, enable_custom_integrations: None
 ) -> None:
     """Test the reauthentication flow regenerates the shared secret."""
-    use_repo_config_dir(hass)
     entry = MockConfigEntry(
         domain=DOMAIN,
         data={
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from tests.components.ical_feed.common import use_repo_config_dir
 from unittest.mock import patch
 
 from homeassistant.core import HomeAssistant
@@ -15,7 +14,6 @@ from tests.common import MockConfigEntry
 
 async def test_diagnostics_redacts_secret(hass: HomeAssistant) -> None:
     """Ensure diagnostics redact the shared secret."""
-    use_repo_config_dir(hass)
     entry = MockConfigEntry(
         domain=DOMAIN,
         data={
@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime, timedelta, timezone
-import re
+from unittest.mock import patch
+
+import pytest
 
-from tests.components.ical_feed.common import use_repo_config_dir
 from homeassistant.components import calendar
 from homeassistant.components.calendar.const import DATA_COMPONENT
 from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
 from custom_components.ical_feed import http
+from custom_components.ical_feed.const import (
+    CONF_CALENDARS,
+    CONF_SECRET,
+    DATA_CACHE,
+    DATA_INFLIGHT,
+    DOMAIN,
+)
+from tests.common import MockConfigEntry
+from tests.typing import ClientSessionGenerator
 
 
 class DummyCalendar(calendar.CalendarEntity):
@@ -20,11 +32,25 @@ class DummyCalendar(calendar.CalendarEntity):
     def __init__(self, entity_id: str, events: list[calendar.CalendarEvent]) -> None:
         self.entity_id = entity_id
         self._events = events
+        self.calls = 0
 
     async def async_get_events(self, hass, start, end):
+        self.calls += 1
         return self._events
 
 
+class GatedCalendar(DummyCalendar):
+    """Calendar entity that holds back its events until released."""
+
+    def __init__(self, entity_id: str, events: list[calendar.CalendarEvent]) -> None:
+        super().__init__(entity_id, events)
+        self.release = asyncio.Event()
+
+    async def async_get_events(self, hass, start, end):
+        await self.release.wait()
+        return await super().async_get_events(hass, start, end)
+
+
 class DummyComponent:
     """Minimal calendar entity component."""
 
@@ -37,40 +63,60 @@ class DummyComponent:
         return None
 
 
-async def test_async_generate_calendar_filters(hass: HomeAssistant) -> None:
-    """Test the calendar feed applies replacements and filters."""
-    use_repo_config_dir(hass)
+async def _async_setup_feed(
+    hass: HomeAssistant, entity: DummyCalendar, secret: str = "secret-token"
+) -> MockConfigEntry:
+    """Set up a feed entry serving the given calendar entity."""
+    assert await async_setup_component(hass, "http", {})
+    hass.data[DATA_COMPONENT] = DummyComponent(entity)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_CALENDARS: [entity.entity_id], CONF_SECRET: secret},
+        title="Office feed",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_async_generate_calendar(hass: HomeAssistant) -> None:
+    """Test the calendar feed renders every event as UTF-8 bytes."""
     now = dt_util.utcnow()
-    event_ok = calendar.CalendarEvent(
+    event_first = calendar.CalendarEvent(
         start=now + timedelta(hours=2),
         end=now + timedelta(hours=3),
-        summary="Original title",
+        summary="Planning",
         description="Details",
         location="HQ",
     )
-    event_skip = calendar.CalendarEvent(
+    event_second = calendar.CalendarEvent(
         start=now + timedelta(hours=4),
         end=now + timedelta(hours=5),
-        summary="Ignore me",
+        summary="Retro",
     )
-    entity = DummyCalendar("calendar.office", [event_skip, event_ok])
+    entity = DummyCalendar("calendar.office", [event_second, event_first])
     hass.data[DATA_COMPONENT] = DummyComponent(entity)
 
-    ical_payload, count = await http._async_generate_calendar(
+    payload, etag, count = await http._async_generate_calendar(
         hass,
         "Team Feed",
         ["calendar.office"],
         past_days=1,
         future_days=1,
-        title_regex=re.compile("Original"),
-        title_replacement="Rewritten",
-        filter_regex=re.compile("Ignore"),
+        time_zone="UTC",
     )
 
-    assert count == 1
+    assert isinstance(payload, bytes)
+    assert etag == http._etag_for_payload(payload)
+    ical_payload = payload.decode("utf-8")
+    assert count == 2
+    assert ical_payload.startswith("BEGIN:VCALENDAR\r\n")
+    assert ical_payload.endswith("END:VCALENDAR\r\n")
     assert "X-WR-CALNAME:Team Feed" in ical_payload
-    assert "SUMMARY:Rewritten title" in ical_payload
-    assert "Ignore me" not in ical_payload
+    assert "X-WR-TIMEZONE:UTC" in ical_payload
+    assert "DESCRIPTION:Details\r\nLOCATION:HQ" in ical_payload
+    assert ical_payload.index("SUMMARY:Planning") < ical_payload.index("SUMMARY:Retro")
 
 
 def test_format_event_all_day() -> None:
@@ -82,15 +128,21 @@ def test_format_event_all_day() -> None:
     )
     now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
 
-    lines = http._format_event(
+    block = http._format_event(
         "calendar.holiday",
         event,
         now,
+        "UTC",
         summary_override="Override",
+        dtstamp="20240101T120000Z",
     )
 
+    lines = block.split("\r\n")
+    assert lines[0] == "BEGIN:VEVENT"
+    assert lines[-1] == "END:VEVENT"
     assert "DTSTART;VALUE=DATE:20240102" in lines
     assert "DTEND;VALUE=DATE:20240103" in lines
+    assert "DTSTAMP:20240101T120000Z" in lines
     assert "SUMMARY:Override" in lines
     assert any(line.startswith("UID:") for line in lines)
 
@@ -102,4 +154,189 @@ def test_ensure_datetime_handles_dict_inputs() -> None:
     assert dt.tzinfo == timezone.utc
 
     midnight = http._ensure_datetime({"date": "2024-05-06"})
-    assert midnight == datetime(2024, 5, 6)
+    assert midnight == datetime(2024, 5, 6, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    assert midnight.tzinfo is dt_util.DEFAULT_TIME_ZONE
+
+    zulu = http._ensure_datetime({"dateTime": "2024-05-06T07:08:09Z"})
+    assert zulu == datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc)
+
+    naive = http._ensure_datetime({"dateTime": "2024-05-06T07:08:09"})
+    assert naive == datetime(2024, 5, 6, 7, 8, 9, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+    fallback = http._ensure_datetime({"dateTime": "not a time", "date": "2024-05-06"})
+    assert fallback == midnight
+
+    assert http._ensure_datetime({"dateTime": "garbage"}) is None
+    assert http._ensure_datetime({}) is None
+
+
+async def test_feed_view_resolves_secret(
+    hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator
+) -> None:
+    """Test the view only serves the current secret of a loaded entry."""
+    entry = await _async_setup_feed(hass, DummyCalendar("calendar.office", []))
+    client = await hass_client_no_auth()
+
+    resp = await client.get("/ical/unknown/feed.ics")
+    assert resp.status == 404
+
+    resp = await client.get("/ical/secret-token/feed.ics")
+    assert resp.status == 200
+
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_SECRET: "rotated-token"}
+    )
+    await hass.async_block_till_done()
+
+    resp = await client.get("/ical/secret-token/feed.ics")
+    assert resp.status == 404
+    resp = await client.get("/ical/rotated-token/feed.ics")
+    assert resp.status == 200
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    resp = await client.get("/ical/rotated-token/feed.ics")
+    assert resp.status == 404
+
+
+async def test_feed_view_coalesces_concurrent_misses(
+    hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator
+) -> None:
+    """Test concurrent requests on a cold cache share one generation."""
+    entity = GatedCalendar("calendar.office", [])
+    await _async_setup_feed(hass, entity)
+    client = await hass_client_no_auth()
+
+    with patch(
+        "custom_components.ical_feed.http._get_cached_feed",
+        wraps=http._get_cached_feed,
+    ) as mock_get_cached:
+        requests = [
+            asyncio.create_task(client.get("/ical/secret-token/feed.ics"))
+            for _ in range(2)
+        ]
+        # Both requests join the refresh right after the cache lookup.
+        async with asyncio.timeout(5):
+            while mock_get_cached.call_count < 2:
+                await asyncio.sleep(0)
+        entity.release.set()
+        first, second = await asyncio.gather(*requests)
+
+    assert first.status == second.status == 200
+    assert entity.calls == 1
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert await first.read() == await second.read()
+    assert hass.data[DOMAIN][DATA_INFLIGHT] == {}
+
+
+async def test_feed_view_revalidates_expired_cache_in_background(
+    hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator
+) -> None:
+    """Test an expired entry answers 304 and refreshes behind the response."""
+    now = dt_util.utcnow()
+    entity = DummyCalendar(
+        "calendar.office",
+        [
+            calendar.CalendarEvent(
+                start=now + timedelta(hours=1),
+                end=now + timedelta(hours=2),
+                summary="Planning",
+            )
+        ],
+    )
+    entry = await _async_setup_feed(hass, entity)
+    client = await hass_client_no_auth()
+
+    resp = await client.get("/ical/secret-token/feed.ics")
+    assert resp.status == 200
+    etag = resp.headers["ETag"]
+    assert entity.calls == 1
+
+    entity._events = [
+        calendar.CalendarEvent(
+            start=now + timedelta(hours=3),
+            end=now + timedelta(hours=4),
+            summary="Retro",
+        )
+    ]
+    hass.data[DOMAIN][DATA_CACHE][entry.entry_id].expires_at = 0
+
+    resp = await client.get(
+        "/ical/secret-token/feed.ics", headers={"If-None-Match": etag}
+    )
+    assert resp.status == 304
+    assert entity.calls == 2
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    resp = await client.get("/ical/secret-token/feed.ics")
+    assert resp.status == 200
+    assert resp.headers["ETag"] != etag
+    body = await resp.text()
+    assert "SUMMARY:Retro" in body
+    assert "SUMMARY:Planning" not in body
+    assert entity.calls == 2
+
+
+async def test_feed_view_logs_failed_background_refresh(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing refresh is logged once and keeps the old entry."""
+    entity = GatedCalendar("calendar.office", [])
+    entity.release.set()
+    entry = await _async_setup_feed(hass, entity)
+    client = await hass_client_no_auth()
+
+    resp = await client.get("/ical/secret-token/feed.ics")
+    assert resp.status == 200
+    etag = resp.headers["ETag"]
+    hass.data[DOMAIN][DATA_CACHE][entry.entry_id].expires_at = 0
+    entity.release.clear()
+
+    with patch(
+        "custom_components.ical_feed.http._build_calendar",
+        side_effect=TypeError("boom"),
+    ):
+        # Both revalidations join the same held back refresh.
+        for _ in range(2):
+            resp = await client.get(
+                "/ical/secret-token/feed.ics", headers={"If-None-Match": etag}
+            )
+            assert resp.status == 304
+        entity.release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    errors = [
+        record
+        for record in caplog.records
+        if record.getMessage().startswith("Background refresh")
+    ]
+    assert len(errors) == 1
+    assert "boom" in errors[0].getMessage()
+    assert entity.calls == 2
+    assert hass.data[DOMAIN][DATA_INFLIGHT] == {}
+    assert hass.data[DOMAIN][DATA_CACHE][entry.entry_id].etag == etag
+
+
+async def test_feed_view_unload_cancels_inflight_refresh(
+    hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator
+) -> None:
+    """Test removing an entry cancels its refresh and caches nothing."""
+    entity = GatedCalendar("calendar.office", [])
+    entry = await _async_setup_feed(hass, entity)
+    client = await hass_client_no_auth()
+
+    request = asyncio.create_task(client.get("/ical/secret-token/feed.ics"))
+    async with asyncio.timeout(5):
+        while not hass.data[DOMAIN][DATA_INFLIGHT]:
+            await asyncio.sleep(0)
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    entity.release.set()
+    resp = await request
+
+    assert resp.status == 404
+    assert hass.data[DOMAIN][DATA_INFLIGHT] == {}
+    assert hass.data[DOMAIN][DATA_CACHE] == {}
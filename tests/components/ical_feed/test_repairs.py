@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import importlib
+from unittest.mock import patch
 
-from tests.components.ical_feed.common import use_repo_config_dir
 from homeassistant.helpers import entity_registry as er, issue_registry as ir
 
+from custom_components import ical_feed as ical_init
 from custom_components.ical_feed.const import CONF_CALENDARS, DOMAIN
 from tests.common import MockConfigEntry
 
@@ -15,7 +15,6 @@ async def test_missing_calendar_issue_created_and_cleared(
     hass, issue_registry: ir.IssueRegistry
 ) -> None:
     """Test that the missing calendar issue is raised and cleared."""
-    use_repo_config_dir(hass)
     entry = MockConfigEntry(
         domain=DOMAIN,
         data={CONF_CALENDARS: ["calendar.office"]},
@@ -23,7 +22,6 @@ async def test_missing_calendar_issue_created_and_cleared(
     )
     entry.add_to_hass(hass)
 
-    ical_init = importlib.import_module("custom_components.ical_feed.__init__")
     ical_init._async_check_missing_calendars(hass, entry)
 
     issue_id = f"{entry.entry_id}_missing_calendar"
@@ -39,3 +37,51 @@ async def test_missing_calendar_issue_created_and_cleared(
     ical_init._async_check_missing_calendars(hass, entry)
 
     assert issue_registry.async_get_issue(DOMAIN, issue_id) is None
+
+
+async def test_registry_updates_only_check_on_relevant_changes(
+    hass, issue_registry: ir.IssueRegistry
+) -> None:
+    """Test plain entity updates skip the check, other registry changes don't."""
+    registry = er.async_get(hass)
+    registry.async_get_or_create(
+        "calendar", "test", "office", suggested_object_id="office"
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_CALENDARS: ["calendar.office"]},
+        title="Office feed",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    issue_id = f"{entry.entry_id}_missing_calendar"
+    assert issue_registry.async_get_issue(DOMAIN, issue_id) is None
+
+    with patch(
+        "custom_components.ical_feed._async_check_missing_calendars",
+        wraps=ical_init._async_check_missing_calendars,
+    ) as mock_check:
+        registry.async_update_entity("calendar.office", name="Office")
+        await hass.async_block_till_done()
+        mock_check.assert_not_called()
+
+        registry.async_update_entity(
+            "calendar.office", new_entity_id="calendar.renamed"
+        )
+        await hass.async_block_till_done()
+        assert mock_check.call_count == 1
+        assert issue_registry.async_get_issue(DOMAIN, issue_id) is not None
+
+        registry.async_get_or_create(
+            "calendar", "test", "office_2", suggested_object_id="office"
+        )
+        await hass.async_block_till_done()
+        assert mock_check.call_count == 2
+        assert issue_registry.async_get_issue(DOMAIN, issue_id) is None
+
+        registry.async_remove("calendar.office")
+        await hass.async_block_till_done()
+        assert mock_check.call_count == 3
+        assert issue_registry.async_get_issue(DOMAIN, issue_id) is not None